@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# (c) Copyright Datacraft, 2026
+"""Throughput and accuracy benchmark for invoice field extraction.
+
+Runs one or more extractors over the invoice corpus written by
+``generate_sample_docs.py --invoices N`` in a process pool and reports
+fields/sec, per-document latency and per-field precision/recall against the
+generated ground truth. An extractor is any importable callable taking a PDF
+path and returning a dict of field name to extracted string; the built-in
+"template" and "vision-llm" extractors are the cheap and expensive ends of
+the routing decision.
+
+The template extractor only knows the standard label set. Recall is also
+reported for the held-out layouts (``--held-out`` in the generator), which
+is where the cheap path is expected to break down.
+"""
+import argparse
+import importlib
+import io
+import json
+import os
+import re
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+DEFAULT_CORPUS = Path(__file__).parent.parent / "demo_documents" / "invoices"
+FIELDS = ("invoice_number", "invoice_date", "supplier", "bill_to", "subtotal", "vat", "total")
+AMOUNT_FIELDS = ("subtotal", "vat", "total")
+DATE_FORMATS = ["%Y-%m-%d", "%d %B %Y", "%d/%m/%Y", "%B %d, %Y", "%d.%m.%Y", "%d-%b-%Y"]
+VISION_MODEL = os.environ.get("VISION_MODEL", "llama3.2-vision")
+
+EXTRACTORS = {
+	"template": f"{__name__}:template_extractor",
+	"vision-llm": f"{__name__}:vision_llm_extractor",
+}
+
+AMOUNT = r"(?:KES\s*)?([\d,]+(?:\.\d+)?)"
+TEMPLATE_PATTERNS = {
+	"invoice_number": re.compile(r"(?:Invoice No|Invoice #|Reference):?\s+([A-Z0-9][A-Z0-9/-]+)"),
+	"invoice_date": re.compile(r"(?:Invoice Date|Issued|Date):?\s+(.+)"),
+	"bill_to": re.compile(r"(?:Bill To|Billed To|Customer):?\s+(.+)"),
+	"subtotal": re.compile(rf"Subtotal:\s*{AMOUNT}"),
+	"vat": re.compile(rf"VAT \(\d+%\):\s*{AMOUNT}"),
+	"total": re.compile(rf"(?:TOTAL|Amount Due|Total Due):\s*{AMOUNT}"),
+}
+COMPANY_RE = re.compile(r"^(.+\b(?:Ltd|Limited|PLC|Inc))\s*$", re.MULTILINE)
+
+VISION_PROMPT = (
+	"Extract these fields from the invoice image and answer with a JSON object only: "
+	"invoice_number, invoice_date (YYYY-MM-DD), supplier (issuing company), bill_to (customer), "
+	"subtotal, vat, total (numbers without currency or separators). Use null for missing fields."
+)
+
+_extractor = None
+
+
+def template_extractor(path):
+	"""Regex extraction over the PDF text layer; cheap but tied to known labels."""
+	from pypdf import PdfReader
+
+	text = "\n".join(page.extract_text() or "" for page in PdfReader(path).pages)
+	fields = {}
+	for field, pattern in TEMPLATE_PATTERNS.items():
+		if match := pattern.search(text):
+			fields[field] = match.group(1).strip()
+	companies = [name.strip() for name in COMPANY_RE.findall(text) if not name.strip().endswith(fields.get("bill_to", "\0"))]
+	if companies:
+		fields["supplier"] = companies[0]
+	return fields
+
+
+def vision_llm_extractor(path):
+	"""Ask a local vision model (via Ollama) to read the rendered first page."""
+	import ollama
+	from pdf2image import convert_from_path
+
+	page = convert_from_path(path, dpi=150, first_page=1, last_page=1)[0]
+	buffer = io.BytesIO()
+	page.save(buffer, format="PNG")
+	response = ollama.chat(
+		model=VISION_MODEL,
+		format="json",
+		messages=[{"role": "user", "content": VISION_PROMPT, "images": [buffer.getvalue()]}],
+	)
+	data = json.loads(response["message"]["content"])
+	return {field: str(data[field]) for field in FIELDS if data.get(field) not in (None, "")}
+
+
+def load_extractor(spec):
+	"""Resolve a built-in name or a ``module:callable`` spec to a callable."""
+	module_name, _, attr = EXTRACTORS.get(spec, spec).partition(":")
+	if not attr:
+		raise SystemExit(f"Extractor must be one of {sorted(EXTRACTORS)} or module:callable, got {spec!r}")
+	return getattr(importlib.import_module(module_name), attr)
+
+
+def _init_worker(spec):
+	global _extractor
+	_extractor = load_extractor(spec)
+
+
+def _extract_one(path):
+	started = time.perf_counter()
+	try:
+		fields, error = _extractor(path), None
+	except Exception as exc:
+		fields, error = {}, f"{type(exc).__name__}: {exc}"
+	return fields, time.perf_counter() - started, error
+
+
+def normalise(field, value):
+	"""Canonicalise a value so formatting differences do not count as errors."""
+	value = " ".join(str(value).split())
+	if field in AMOUNT_FIELDS:
+		try:
+			return Decimal(re.sub(r"[^\d.]", "", value)).normalize()
+		except InvalidOperation:
+			return None
+	if field == "invoice_date":
+		for fmt in DATE_FORMATS:
+			try:
+				return datetime.strptime(value, fmt).date()
+			except ValueError:
+				continue
+		return None
+	return value.casefold()
+
+
+def load_ground_truth(corpus, limit=None):
+	path = Path(corpus) / "ground_truth.jsonl"
+	if not path.exists():
+		raise SystemExit(f"No ground truth at {path}; run generate_sample_docs.py --invoices N first")
+	with open(path) as handle:
+		records = [json.loads(line) for line in handle if line.strip()]
+	records = records[:limit] if limit is not None else records
+	if not records:
+		raise SystemExit(f"No invoices to benchmark in {path}")
+	return records
+
+
+class ExtractionStats:
+	def __init__(self, name):
+		self.name = name
+		self.documents = 0
+		self.held_out_documents = 0
+		self.errors = Counter()
+		self.latency = []
+		self.success_latency = []
+		self.wall = 0.0
+		self.predicted = dict.fromkeys(FIELDS, 0)
+		self.correct = dict.fromkeys(FIELDS, 0)
+		self.held_out_correct = dict.fromkeys(FIELDS, 0)
+
+	def record(self, record, fields, seconds, error):
+		truth, held_out = record["fields"], record.get("layout", {}).get("held_out", False)
+		self.documents += 1
+		self.held_out_documents += held_out
+		self.latency.append(seconds)
+		if error is not None:
+			self.errors[error] += 1
+		else:
+			self.success_latency.append(seconds)
+		for field in FIELDS:
+			if fields.get(field) in (None, ""):
+				continue
+			self.predicted[field] += 1
+			correct = normalise(field, fields[field]) == normalise(field, truth[field])
+			self.correct[field] += correct
+			self.held_out_correct[field] += correct and held_out
+
+	@property
+	def error_count(self):
+		return sum(self.errors.values())
+
+	@property
+	def error_rate(self):
+		return self.error_count / self.documents if self.documents else 0.0
+
+	@property
+	def cost(self):
+		"""Mean latency of documents that extracted without raising."""
+		return statistics.fmean(self.success_latency) if self.success_latency else float("inf")
+
+	@property
+	def fields_extracted(self):
+		return sum(self.predicted.values())
+
+	def precision(self, field):
+		return self.correct[field] / self.predicted[field] if self.predicted[field] else 0.0
+
+	def recall(self, field):
+		return self.correct[field] / self.documents if self.documents else 0.0
+
+	def held_out_recall(self, field):
+		return self.held_out_correct[field] / self.held_out_documents if self.held_out_documents else None
+
+
+def run_extractor(spec, corpus, records, workers):
+	load_extractor(spec)  # fail fast here rather than inside every worker
+	stats = ExtractionStats(spec)
+	paths = [str(Path(corpus) / record["file"]) for record in records]
+	started = time.perf_counter()
+	with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(spec,)) as pool:
+		for record, result in zip(records, pool.map(_extract_one, paths, chunksize=max(1, len(paths) // (workers * 8)))):
+			stats.record(record, *result)
+	stats.wall = time.perf_counter() - started
+	return stats
+
+
+def percentile(values, pct):
+	if not values:
+		return 0.0
+	ordered = sorted(values)
+	return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def report(stats, workers):
+	print(f"\n[{stats.name}] {stats.documents} documents, {stats.fields_extracted} fields "
+		f"in {stats.wall:.2f}s with {workers} workers ({stats.error_count} errors)")
+	for error, count in stats.errors.most_common(3):
+		print(f"  {count:>5} × {error}")
+	print(f"  Throughput: {stats.fields_extracted / stats.wall:,.1f} fields/s, "
+		f"{stats.documents / stats.wall:,.1f} docs/s")
+	print(f"  Latency:    mean {statistics.fmean(stats.latency) * 1000:.1f}ms, "
+		f"p50 {percentile(stats.latency, 50) * 1000:.1f}ms, p95 {percentile(stats.latency, 95) * 1000:.1f}ms per document")
+	held_out_label = f"Held-out ({stats.held_out_documents})"
+	print(f"  {'Field':<16}{'Precision':>10}{'Recall':>10}{held_out_label:>18}")
+	for field in FIELDS:
+		held_out = stats.held_out_recall(field)
+		held_out = "n/a" if held_out is None else f"{held_out:.1%}"
+		print(f"  {field:<16}{stats.precision(field):>10.1%}{stats.recall(field):>10.1%}{held_out:>18}")
+
+
+def report_routing(results, min_accuracy, max_error_rate):
+	"""Per field, pick the lowest-latency extractor that meets the accuracy bar.
+
+	Cost is the mean latency of successful documents only, and extractors
+	failing on more than max_error_rate of documents are left out entirely so
+	a quickly-crashing extractor cannot look cheap.
+	"""
+	usable = [s for s in results if s.error_rate <= max_error_rate and s.success_latency]
+	for stats in results:
+		if stats not in usable:
+			print(f"\nExcluded from routing: {stats.name} ({stats.error_rate:.0%} of documents failed)")
+	if not usable:
+		return
+	print(f"\nRouting (lowest-latency extractor with precision and recall >= {min_accuracy:.0%}):")
+	by_cost = sorted(usable, key=lambda stats: stats.cost)
+	for field in FIELDS:
+		good = [s for s in by_cost if s.precision(field) >= min_accuracy and s.recall(field) >= min_accuracy]
+		choice = good[0].name if good else f"{max(by_cost, key=lambda s: s.recall(field)).name} (below bar)"
+		print(f"  {field:<16} → {choice}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Directory with invoices and ground_truth.jsonl")
+	parser.add_argument("--extractor", action="append", dest="extractors",
+		help=f"Built-in ({', '.join(EXTRACTORS)}) or module:callable; repeat to compare")
+	parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Process pool size")
+	parser.add_argument("--limit", type=int, help="Only use the first N invoices")
+	parser.add_argument("--min-accuracy", type=float, default=0.98, help="Accuracy bar for routing")
+	parser.add_argument("--max-error-rate", type=float, default=0.05,
+		help="Extractors failing on more documents than this are not routed to")
+	args = parser.parse_args()
+	if args.workers < 1:
+		parser.error("--workers must be at least 1")
+
+	records = load_ground_truth(args.corpus, args.limit)
+	results = []
+	for spec in args.extractors or ["template"]:
+		results.append(run_extractor(spec, args.corpus, records, args.workers))
+		report(results[-1], args.workers)
+	if len(results) > 1:
+		report_routing(results, args.min_accuracy, args.max_error_rate)
+
+
+if __name__ == "__main__":
+	main()
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 # (c) Copyright Datacraft, 2026
 """Generate sample PDF documents for dArchiva demo."""
+import argparse
+import json
+import random
 from pathlib import Path
-from datetime import date
+from datetime import date, timedelta
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.units import cm
@@ -14,52 +17,186 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 
 styles = getSampleStyleSheet()
 
-def create_invoice():
-	"""Create a sample invoice for Finance department."""
-	doc = SimpleDocTemplate(str(OUTPUT_DIR / "Invoice_2026_001.pdf"), pagesize=A4)
+INVOICE_FIELDS = ("invoice_number", "invoice_date", "supplier", "bill_to", "subtotal", "vat", "total")
+
+SUPPLIERS = [
+	("Acme Supplies Ltd", "123 Industrial Area, Nairobi", "+254 20 123 4567"),
+	("Savanna Office Solutions Ltd", "45 Mombasa Road, Nairobi", "+254 20 555 0199"),
+	("Rift Valley Traders Ltd", "8 Kenyatta Avenue, Nakuru", "+254 51 221 3400"),
+	("Coastline Logistics Ltd", "17 Moi Avenue, Mombasa", "+254 41 231 7788"),
+	("Highlands Print & Paper Ltd", "2 Gakere Road, Nyeri", "+254 61 203 0145"),
+	("Lakeside Technologies Ltd", "90 Oginga Odinga Street, Kisumu", "+254 57 202 6612"),
+]
+CUSTOMERS = [
+	"Datacraft Kenya Ltd", "Nairobi County Archives", "Kilimo Bank PLC",
+	"Umoja Insurance Ltd", "East Africa Health Trust", "Jua Kali Manufacturers Ltd",
+]
+CATALOGUE = [
+	("Office Supplies", 5000), ("Computer Equipment", 85000), ("Software License", 12000),
+	("Archive Boxes", 450), ("Scanner Maintenance", 32000), ("Printer Toner", 9800),
+	("Document Shredding", 15000), ("Network Cabling", 2700), ("Filing Cabinets", 23500),
+	("Courier Services", 1200), ("Barcode Labels", 60), ("Training Workshop", 75000),
+]
+INVOICE_LABELS = [
+	{"title": "INVOICE", "number": "Invoice No", "date": "Date", "bill_to": "Bill To", "total": "TOTAL"},
+	{"title": "TAX INVOICE", "number": "Invoice #", "date": "Invoice Date", "bill_to": "Customer", "total": "Amount Due"},
+	{"title": "COMMERCIAL INVOICE", "number": "Reference", "date": "Issued", "bill_to": "Billed To", "total": "Total Due"},
+]
+DATE_FORMATS = ["%d %B %Y", "%Y-%m-%d", "%d/%m/%Y", "%B %d, %Y"]
+# Held-out variants that template extractors are not tuned for, so a benchmark
+# can show where a label-driven extractor stops generalising.
+HELD_OUT_LABELS = [
+	{"title": "BILL", "number": "Doc Ref", "date": "Dated", "bill_to": "Sold To", "total": "Grand Total"},
+	{"title": "STATEMENT OF CHARGES", "number": "Our Ref", "date": "Posted On", "bill_to": "Account", "total": "Balance Payable"},
+]
+HELD_OUT_DATE_FORMATS = ["%d.%m.%Y", "%d-%b-%Y"]
+HELD_OUT_SHARE = 0.2
+VAT_RATES = [16, 16, 16, 8, 0]
+
+DEMO_LAYOUT = {
+	"labels": INVOICE_LABELS[0], "date_format": DATE_FORMATS[0],
+	"details": "lines", "header": "title_first", "totals": "table",
+}
+
+
+def build_invoice(path, invoice, layout=DEMO_LAYOUT):
+	"""Render an invoice from its field values using one of the layout variants."""
+	labels = layout["labels"]
+	doc = SimpleDocTemplate(str(path), pagesize=A4)
 	story = []
 
 	# Header
-	story.append(Paragraph("<b>INVOICE</b>", styles['Title']))
-	story.append(Spacer(1, 0.5*cm))
-
-	# Company info
-	story.append(Paragraph("<b>Acme Supplies Ltd</b>", styles['Heading2']))
-	story.append(Paragraph("123 Industrial Area, Nairobi", styles['Normal']))
-	story.append(Paragraph("Tel: +254 20 123 4567", styles['Normal']))
-	story.append(Spacer(1, 1*cm))
+	title = [Paragraph(f"<b>{labels['title']}</b>", styles['Title']), Spacer(1, 0.5*cm)]
+	supplier = [
+		Paragraph(f"<b>{invoice['supplier']}</b>", styles['Heading2']),
+		Paragraph(invoice['supplier_address'], styles['Normal']),
+		Paragraph(f"Tel: {invoice['supplier_phone']}", styles['Normal']),
+		Spacer(1, 1*cm),
+	]
+	story.extend(title + supplier if layout["header"] == "title_first" else supplier + title)
 
 	# Invoice details
-	story.append(Paragraph(f"Invoice No: INV-2026-001", styles['Normal']))
-	story.append(Paragraph(f"Date: {date.today().strftime('%d %B %Y')}", styles['Normal']))
-	story.append(Paragraph("Bill To: Datacraft Kenya Ltd", styles['Normal']))
+	details = [
+		(labels['number'], invoice['invoice_number']),
+		(labels['date'], invoice['invoice_date'].strftime(layout['date_format'])),
+		(labels['bill_to'], invoice['bill_to']),
+	]
+	if layout["details"] == "lines":
+		story.extend(Paragraph(f"{label}: {value}", styles['Normal']) for label, value in details)
+	else:
+		grid = Table([[label, value] for label, value in details], colWidths=[4*cm, 8*cm], hAlign='LEFT')
+		grid.setStyle(TableStyle([('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold')]))
+		story.append(grid)
 	story.append(Spacer(1, 1*cm))
 
 	# Items table
-	data = [
-		['Item', 'Qty', 'Unit Price (KES)', 'Total (KES)'],
-		['Office Supplies', '10', '5,000', '50,000'],
-		['Computer Equipment', '2', '85,000', '170,000'],
-		['Software License', '5', '12,000', '60,000'],
-		['', '', 'Subtotal:', '280,000'],
-		['', '', 'VAT (16%):', '44,800'],
-		['', '', 'TOTAL:', '324,800'],
+	data = [['Item', 'Qty', 'Unit Price (KES)', 'Total (KES)']]
+	data += [[name, str(qty), f"{price:,}", f"{qty * price:,}"] for name, qty, price in invoice['items']]
+	totals = [
+		('Subtotal:', invoice['subtotal']),
+		(f"VAT ({invoice['vat_rate']}%):", invoice['vat']),
+		(f"{labels['total']}:", invoice['total']),
 	]
+	if layout["totals"] == "table":
+		data += [['', '', label, f"{amount:,}"] for label, amount in totals]
 	table = Table(data, colWidths=[8*cm, 2*cm, 4*cm, 4*cm])
-	table.setStyle(TableStyle([
+	table_style = [
 		('BACKGROUND', (0, 0), (-1, 0), colors.grey),
 		('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
 		('GRID', (0, 0), (-1, -1), 1, colors.black),
 		('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-		('FONTNAME', (2, -3), (3, -1), 'Helvetica-Bold'),
-	]))
+	]
+	if layout["totals"] == "table":
+		table_style.append(('FONTNAME', (2, -3), (3, -1), 'Helvetica-Bold'))
+	table.setStyle(TableStyle(table_style))
 	story.append(table)
 	story.append(Spacer(1, 1*cm))
+	if layout["totals"] == "block":
+		story.extend(Paragraph(f"<b>{label}</b> KES {amount:,}", styles['Normal']) for label, amount in totals)
+		story.append(Spacer(1, 0.5*cm))
 	story.append(Paragraph("Payment Terms: Net 30 days", styles['Normal']))
 
 	doc.build(story)
+
+
+def create_invoice():
+	"""Create a sample invoice for Finance department."""
+	supplier, address, phone = SUPPLIERS[0]
+	build_invoice(OUTPUT_DIR / "Invoice_2026_001.pdf", {
+		"invoice_number": "INV-2026-001",
+		"invoice_date": date.today(),
+		"supplier": supplier,
+		"supplier_address": address,
+		"supplier_phone": phone,
+		"bill_to": "Datacraft Kenya Ltd",
+		"items": [("Office Supplies", 10, 5000), ("Computer Equipment", 2, 85000), ("Software License", 5, 12000)],
+		"subtotal": 280000,
+		"vat_rate": 16,
+		"vat": 44800,
+		"total": 324800,
+	})
 	print("  ✓ Invoice_2026_001.pdf")
 
+
+def random_invoice(rng, index, held_out=HELD_OUT_SHARE):
+	"""Draw invoice field values and a layout variant from the given RNG.
+
+	A ``held_out`` fraction of invoices use labels and date formats outside
+	the standard set.
+	"""
+	supplier, address, phone = rng.choice(SUPPLIERS)
+	items = [(name, rng.randint(1, 25), price) for name, price in rng.sample(CATALOGUE, rng.randint(1, 6))]
+	subtotal = sum(qty * price for _, qty, price in items)
+	vat_rate = rng.choice(VAT_RATES)
+	vat = subtotal * vat_rate // 100
+	prefix = supplier.split()[0][:3].upper()
+	invoice = {
+		"invoice_number": rng.choice([
+			f"INV-2026-{index:05d}", f"{prefix}/{index:06d}", f"{prefix}-26{index:05d}",
+		]),
+		"invoice_date": date(2026, 1, 1) + timedelta(days=rng.randrange(365)),
+		"supplier": supplier,
+		"supplier_address": address,
+		"supplier_phone": phone,
+		"bill_to": rng.choice(CUSTOMERS),
+		"items": items,
+		"subtotal": subtotal,
+		"vat_rate": vat_rate,
+		"vat": vat,
+		"total": subtotal + vat,
+	}
+	layout = {
+		"held_out": rng.random() < held_out,
+		"details": rng.choice(["lines", "grid"]),
+		"header": rng.choice(["title_first", "supplier_first"]),
+		"totals": rng.choice(["table", "block"]),
+	}
+	layout["labels"] = rng.choice(HELD_OUT_LABELS if layout["held_out"] else INVOICE_LABELS)
+	layout["date_format"] = rng.choice(HELD_OUT_DATE_FORMATS if layout["held_out"] else DATE_FORMATS)
+	return invoice, layout
+
+
+def create_invoice_corpus(count, output_dir, seed=2026, held_out=HELD_OUT_SHARE):
+	"""Create varied invoices plus a ground_truth.jsonl of their field values."""
+	output_dir = Path(output_dir)
+	output_dir.mkdir(parents=True, exist_ok=True)
+	rng = random.Random(seed)
+
+	with open(output_dir / "ground_truth.jsonl", "w") as ground_truth:
+		for index in range(1, count + 1):
+			invoice, layout = random_invoice(rng, index, held_out)
+			filename = f"invoice_{index:05d}.pdf"
+			build_invoice(output_dir / filename, invoice, layout)
+			fields = {field: str(invoice[field]) for field in INVOICE_FIELDS}
+			fields["invoice_date"] = invoice["invoice_date"].isoformat()
+			ground_truth.write(json.dumps({
+				"file": filename,
+				"fields": fields,
+				"layout": {**layout, "labels": layout["labels"]["title"]},
+			}) + "\n")
+
+	print(f"  ✓ {count} invoices with ground truth in {output_dir}")
+
 def create_contract():
 	"""Create a sample contract for Legal department."""
 	doc = SimpleDocTemplate(str(OUTPUT_DIR / "Service_Agreement_2026.pdf"), pagesize=A4)
@@ -251,6 +388,18 @@ def create_memo():
 	print("  ✓ Memo_System_Maintenance.pdf")
 
 def main():
+	parser = argparse.ArgumentParser(description="Generate sample PDF documents for dArchiva demo.")
+	parser.add_argument("--invoices", type=int, default=0,
+		help="Also generate this many varied invoices with field ground truth")
+	parser.add_argument("--invoice-dir", default=OUTPUT_DIR / "invoices",
+		help="Where to write the generated invoice corpus")
+	parser.add_argument("--seed", type=int, default=2026, help="Seed for the invoice corpus")
+	parser.add_argument("--held-out", type=float, default=HELD_OUT_SHARE,
+		help="Fraction of invoices using held-out labels and date formats")
+	args = parser.parse_args()
+	if not 0 <= args.held_out <= 1:
+		parser.error("--held-out must be between 0 and 1")
+
 	print("=" * 50)
 	print("Generating Sample Documents")
 	print("=" * 50)
@@ -261,6 +410,8 @@ def main():
 	create_employment_letter()
 	create_policy_document()
 	create_memo()
+	if args.invoices:
+		create_invoice_corpus(args.invoices, args.invoice_dir, args.seed, args.held_out)
 
 	print("\n" + "=" * 50)
 	print("Documents ready for scanning demo!")
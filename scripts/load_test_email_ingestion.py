@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+# (c) Copyright Datacraft, 2026
+"""Burst simulator for the email ingestion pipeline.
+
+Starts a local SMTP/IMAP stand-in, floods it with messages carrying PDF
+attachments and measures how quickly they can be pulled back out, comparing
+one-message-per-command, batched and pipelined IMAP fetching. With --api the
+stand-in is registered as an IMAP account on a live dArchiva server, a sync
+is requested once the burst is in the mailbox, and the archive's searchable
+throughput and per-message latency from the sync request are measured.
+"""
+import argparse
+import asyncio
+import imaplib
+import random
+import re
+import smtplib
+import statistics
+import time
+import uuid
+from collections import deque
+from email import policy
+from email.message import EmailMessage
+from email.parser import BytesParser
+from pathlib import Path
+
+BASE_URL = "http://localhost:8000/api/v1"
+API_TOKEN = "test-api-token"
+DEFAULT_CORPUS = Path(__file__).parent.parent / "demo_documents"
+MAIL_USER = "archive@corp.net"
+MAIL_PASSWORD = "burst"
+FETCH_ITEMS = "(UID RFC822.SIZE BODY.PEEK[])"
+
+LITERAL_RE = re.compile(rb"\{(\d+)\}\r\n$")
+
+
+class Mailbox:
+	"""In-memory INBOX shared by the SMTP and IMAP stand-ins."""
+
+	def __init__(self):
+		self.messages = []
+
+	def append(self, data):
+		uid = len(self.messages) + 1
+		self.messages.append((uid, data))
+		return uid
+
+	def resolve(self, spec):
+		"""Expand an IMAP sequence set into (seq, uid, data) tuples."""
+		highest = len(self.messages)
+		selected = set()
+		for part in spec.split(","):
+			start, _, end = part.partition(":")
+			low = highest if start == "*" else int(start)
+			high = low if not end else (highest if end == "*" else int(end))
+			low, high = min(low, high), max(low, high)
+			selected.update(range(max(low, 1), min(high, highest) + 1))
+		# Sequence numbers and UIDs coincide because nothing is ever expunged.
+		return [(n, *self.messages[n - 1]) for n in sorted(selected)]
+
+
+class DelayedWriter:
+	"""Deliver server responses after a fixed one-way delay, preserving order.
+
+	Delaying delivery rather than processing keeps the server able to accept
+	further commands while earlier responses are "on the wire", which is what
+	makes pipelining pay off against a remote mailbox.
+	"""
+
+	def __init__(self, writer, rtt):
+		self.writer = writer
+		self.rtt = rtt
+		self.queue = asyncio.Queue()
+		self.task = asyncio.create_task(self._drain())
+
+	def write(self, data):
+		self.queue.put_nowait((time.perf_counter() + self.rtt, data))
+
+	async def _drain(self):
+		while True:
+			due, data = await self.queue.get()
+			if data is None:
+				break
+			delay = due - time.perf_counter()
+			if delay > 0:
+				await asyncio.sleep(delay)
+			self.writer.write(data)
+			await self.writer.drain()
+
+	async def close(self):
+		self.queue.put_nowait((0, None))
+		await self.task
+		self.writer.close()
+
+
+class ImapStandIn:
+	"""Minimal IMAP4rev1 server exposing a single read-only INBOX."""
+
+	def __init__(self, mailbox, rtt=0.0):
+		self.mailbox = mailbox
+		self.rtt = rtt
+
+	async def handle(self, reader, writer):
+		out = DelayedWriter(writer, self.rtt)
+		out.write(b"* OK [CAPABILITY IMAP4rev1] dArchiva burst stand-in ready\r\n")
+		try:
+			while line := await reader.readline():
+				tag, _, rest = line.decode().rstrip("\r\n").partition(" ")
+				command, _, args = rest.partition(" ")
+				if not self.dispatch(out, tag, command.upper(), args):
+					break
+		except ConnectionError:
+			pass
+		finally:
+			await out.close()
+
+	def dispatch(self, out, tag, command, args):
+		by_uid = command == "UID"
+		if by_uid:
+			command, _, args = args.partition(" ")
+			command = command.upper()
+
+		if command == "CAPABILITY":
+			out.write(b"* CAPABILITY IMAP4rev1\r\n")
+		elif command in ("SELECT", "EXAMINE"):
+			total = len(self.mailbox.messages)
+			out.write(
+				f"* {total} EXISTS\r\n* 0 RECENT\r\n* FLAGS (\\Seen)\r\n"
+				f"* OK [UIDVALIDITY 1] UIDs valid\r\n* OK [UIDNEXT {total + 1}] Predicted next UID\r\n".encode()
+			)
+		elif command == "SEARCH":
+			uids = " ".join(str(uid) for uid, _ in self.mailbox.messages)
+			out.write(f"* SEARCH {uids}\r\n".encode())
+		elif command == "FETCH":
+			spec, _, items = args.partition(" ")
+			self.fetch(out, spec, items.upper(), by_uid)
+		elif command == "LOGOUT":
+			out.write(b"* BYE logging out\r\n")
+			out.write(f"{tag} OK LOGOUT completed\r\n".encode())
+			return False
+		elif command not in ("LOGIN", "NOOP", "STORE", "CLOSE", "EXPUNGE", "CHECK"):
+			out.write(f"{tag} BAD unsupported command\r\n".encode())
+			return True
+		out.write(f"{tag} OK {command} completed\r\n".encode())
+		return True
+
+	def fetch(self, out, spec, items, by_uid):
+		"""Answer UID, FLAGS, RFC822.SIZE and whole-message RFC822/BODY[] items."""
+		requested = items.strip("()").split()
+		if "RFC822" in requested:
+			body_item = "RFC822"
+		elif any(item.startswith(("BODY[", "BODY.PEEK[")) for item in requested):
+			body_item = "BODY[]"
+		else:
+			body_item = None
+		for seq, uid, data in self.mailbox.resolve(spec):
+			parts = []
+			if by_uid or "UID" in requested:
+				parts.append(f"UID {uid}")
+			if "FLAGS" in requested:
+				parts.append("FLAGS ()")
+			if "RFC822.SIZE" in requested:
+				parts.append(f"RFC822.SIZE {len(data)}")
+			head = f"* {seq} FETCH ({' '.join(parts)}"
+			if body_item:
+				out.write(f"{head}{' ' if parts else ''}{body_item} {{{len(data)}}}\r\n".encode() + data + b")\r\n")
+			else:
+				out.write(f"{head})\r\n".encode())
+
+
+class SmtpStandIn:
+	"""Minimal SMTP receiver that delivers every message into the mailbox."""
+
+	def __init__(self, mailbox):
+		self.mailbox = mailbox
+
+	async def handle(self, reader, writer):
+		writer.write(b"220 darchiva-burst ESMTP ready\r\n")
+		try:
+			while line := await reader.readline():
+				verb = line[:4].upper()
+				if verb == b"EHLO":
+					writer.write(b"250-darchiva-burst\r\n250-PIPELINING\r\n250 8BITMIME\r\n")
+				elif verb == b"DATA":
+					writer.write(b"354 end data with <CR><LF>.<CR><LF>\r\n")
+					await writer.drain()
+					uid = self.mailbox.append(await self.read_data(reader))
+					writer.write(f"250 queued as {uid}\r\n".encode())
+				elif verb == b"QUIT":
+					writer.write(b"221 bye\r\n")
+					break
+				else:
+					writer.write(b"250 OK\r\n")
+				await writer.drain()
+		except ConnectionError:
+			pass
+		finally:
+			writer.close()
+
+	@staticmethod
+	async def read_data(reader):
+		lines = []
+		while (line := await reader.readline()) not in (b".\r\n", b""):
+			lines.append(line[1:] if line.startswith(b"..") else line)
+		return b"".join(lines)
+
+
+class ImapClient:
+	"""Tiny asyncio IMAP client that can keep several commands in flight."""
+
+	def __init__(self, reader, writer):
+		self.reader = reader
+		self.writer = writer
+		self.counter = 0
+
+	@classmethod
+	async def connect(cls, host, port):
+		reader, writer = await asyncio.open_connection(host, port)
+		client = cls(reader, writer)
+		await reader.readline()
+		return client
+
+	def send(self, command):
+		self.counter += 1
+		tag = f"A{self.counter:05d}"
+		self.writer.write(f"{tag} {command}\r\n".encode())
+		return tag
+
+	async def read_response(self, tag):
+		"""Read untagged responses up to and including the tagged completion."""
+		untagged = []
+		marker = f"{tag} ".encode()
+		while True:
+			line = await self.reader.readline()
+			if not line:
+				raise ConnectionError("IMAP connection closed")
+			if line.startswith(marker):
+				if not line[len(marker):].startswith(b"OK"):
+					raise RuntimeError(line.decode().strip())
+				return untagged
+			literals = []
+			while match := LITERAL_RE.search(line):
+				literals.append(await self.reader.readexactly(int(match.group(1))))
+				line = await self.reader.readline()
+			untagged.append((line, literals))
+
+	async def command(self, command):
+		tag = self.send(command)
+		await self.writer.drain()
+		return await self.read_response(tag)
+
+	async def close(self):
+		try:
+			await self.command("LOGOUT")
+		finally:
+			self.writer.close()
+
+
+def load_corpus(corpus_dir):
+	pdfs = sorted(Path(corpus_dir).rglob("*.pdf"))
+	if not pdfs:
+		raise SystemExit(f"No PDF files found in {corpus_dir}")
+	return [(path.stem, path.read_bytes()) for path in pdfs]
+
+
+def build_message(index, run_id, corpus, max_attachments):
+	"""Build one supplier email; the token lets the archive search find it."""
+	token = f"burst{run_id}n{index:06d}"
+	msg = EmailMessage()
+	msg["From"] = f"accounts{index % 97}@supplier{index % 13}.example"
+	msg["To"] = MAIL_USER
+	msg["Subject"] = f"Month-end invoice {index} [{token}]"
+	msg["Message-ID"] = f"<{token}@darchiva-burst>"
+	msg.set_content(f"Please find attached our documents for this period.\n\nReference: {token}\n")
+	for n in range(random.randint(1, max_attachments)):
+		stem, data = random.choice(corpus)
+		msg.add_attachment(data, maintype="application", subtype="pdf", filename=f"{stem}_{token}_{n}.pdf")
+	return token, msg
+
+
+def send_batch(host, port, messages):
+	with smtplib.SMTP(host, port) as smtp:
+		for msg in messages:
+			smtp.send_message(msg)
+
+
+async def seed_mailbox(host, port, messages, connections):
+	"""Push the burst through the SMTP stand-in over parallel connections."""
+	chunks = [messages[i::connections] for i in range(connections)]
+	await asyncio.gather(*(asyncio.to_thread(send_batch, host, port, chunk) for chunk in chunks if chunk))
+
+
+def extract_attachments(data):
+	"""Parse a raw message and decode its attachments, as the importer would."""
+	msg = BytesParser(policy=policy.default).parsebytes(data)
+	attachments = [part.get_content() for part in msg.iter_attachments()]
+	if not all(payload.startswith(b"%PDF") for payload in attachments):
+		raise ValueError(f"Corrupt attachment in {msg['Message-ID']}")
+	return len(attachments)
+
+
+def check_stdlib_client(port, expected):
+	"""Confirm an imaplib client, as the archive's importer uses, can read the stand-in."""
+	client = imaplib.IMAP4("127.0.0.1", port)
+	try:
+		client.login(MAIL_USER, MAIL_PASSWORD)
+		client.select("INBOX")
+		_, data = client.search(None, "ALL")
+		ids = data[0].split()
+		_, msg_data = client.fetch(ids[0], "(RFC822)")
+	finally:
+		client.logout()
+	if len(ids) != expected or not isinstance(msg_data[0], tuple) or not msg_data[0][1].startswith(b"From:"):
+		raise SystemExit(f"IMAP stand-in failed the imaplib SEARCH/FETCH (RFC822) check: {msg_data[:1]!r}")
+
+
+class FetchStats:
+	def __init__(self, mode):
+		self.mode = mode
+		self.messages = 0
+		self.attachments = 0
+		self.bytes = 0
+		self.commands = 0
+		self.command_latency = []
+		self.extract_time = []
+		self.raw = []
+		self.wall = 0.0
+		self.extract_wall = 0.0
+
+	def record(self, untagged, sent_at):
+		"""Note a completed command; parsing is deferred so it does not delay reads."""
+		self.commands += 1
+		self.command_latency.append(time.perf_counter() - sent_at)
+		for _, literals in untagged:
+			self.raw.extend(literals)
+
+	def extract(self):
+		started = time.perf_counter()
+		for data in self.raw:
+			part_started = time.perf_counter()
+			self.attachments += extract_attachments(data)
+			self.extract_time.append(time.perf_counter() - part_started)
+			self.messages += 1
+			self.bytes += len(data)
+		self.extract_wall = time.perf_counter() - started
+		self.raw = []
+
+
+async def fetch_all(host, port, uids, mode, batch_size, depth):
+	"""Fetch every UID using the given strategy, then extract its attachments.
+
+	Only the network receive is timed as fetch wall time; attachment parsing
+	runs afterwards so it neither inflates command latency nor favours modes
+	that overlap it with waiting on the wire.
+
+	single:    one UID FETCH per message, waiting for each reply.
+	batched:   one UID FETCH per batch_size consecutive UIDs.
+	pipelined: one UID FETCH per message, up to depth commands in flight.
+	"""
+	stats = FetchStats(mode)
+	client = await ImapClient.connect(host, port)
+	await client.command(f'LOGIN "{MAIL_USER}" "{MAIL_PASSWORD}"')
+	await client.command("SELECT INBOX")
+
+	if mode == "batched":
+		specs = [f"{chunk[0]}:{chunk[-1]}" for chunk in (uids[i:i + batch_size] for i in range(0, len(uids), batch_size))]
+	else:
+		specs = [str(uid) for uid in uids]
+	window = depth if mode == "pipelined" else 1
+
+	started = time.perf_counter()
+	pending = deque()
+	specs = deque(specs)
+	while specs or pending:
+		while specs and len(pending) < window:
+			pending.append((client.send(f"UID FETCH {specs.popleft()} {FETCH_ITEMS}"), time.perf_counter()))
+		await client.writer.drain()
+		tag, sent_at = pending.popleft()
+		stats.record(await client.read_response(tag), sent_at)
+	stats.wall = time.perf_counter() - started
+
+	await client.close()
+	stats.extract()
+	return stats
+
+
+def percentile(values, pct):
+	if not values:
+		return 0.0
+	ordered = sorted(values)
+	return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def report_fetch(stats):
+	print(f"\n[{stats.mode}] {stats.messages} messages / {stats.attachments} attachments fetched in {stats.wall:.2f}s")
+	print(f"  Fetch throughput:      {stats.messages / stats.wall:,.1f} msg/s, "
+		f"{stats.bytes / stats.wall / 1e6:,.2f} MB/s over {stats.commands} commands")
+	print(f"  Command latency:       p50 {percentile(stats.command_latency, 50) * 1000:.1f}ms, "
+		f"p95 {percentile(stats.command_latency, 95) * 1000:.1f}ms")
+	print(f"  Attachment extraction: mean {statistics.fmean(stats.extract_time) * 1000:.2f}ms, "
+		f"p95 {percentile(stats.extract_time, 95) * 1000:.2f}ms per message, "
+		f"{stats.messages / stats.extract_wall:,.1f} msg/s on one core")
+
+
+async def measure_searchable(args, tokens, imap_port):
+	"""Register the stand-in with a live dArchiva and time each message to search.
+
+	The whole burst is already in the mailbox when the sync is requested, so
+	latencies are measured from that request.
+	"""
+	import httpx
+
+	headers = {"Authorization": f"Bearer {args.api_token}"}
+	async with httpx.AsyncClient(base_url=args.base_url, headers=headers, timeout=30) as client:
+		response = await client.post("/emails/accounts", json={
+			"name": f"Burst simulator {tokens[0][:14]}",
+			"account_type": "imap",
+			"email_address": MAIL_USER,
+			"imap_host": args.advertise_host,
+			"imap_port": imap_port,
+			"imap_use_ssl": False,
+			"imap_username": MAIL_USER,
+			"imap_password": MAIL_PASSWORD,
+			"sync_folders": ["INBOX"],
+			"auto_process": True,
+			"import_attachments": True,
+		})
+		if response.status_code != 201:
+			print(f"Failed to register email account: {response.text}")
+			return
+		account_id = response.json()["id"]
+
+		try:
+			sync_started = time.time()
+			await client.post(f"/emails/accounts/{account_id}/sync")
+			latencies, detection_gaps = [], []
+			last_probe = {}
+			# Rotate: each round probes at most --probe-batch tokens so a message
+			# is re-checked every few seconds, not once per sweep over the burst.
+			pending = deque(tokens)
+			semaphore = asyncio.Semaphore(args.search_concurrency)
+
+			async def probe(token):
+				async with semaphore:
+					resp = await client.post("/search", json={"query": token, "mode": "keyword", "limit": 1})
+				checked_at = time.time()
+				previous, last_probe[token] = last_probe.get(token, sync_started), checked_at
+				if resp.status_code == 200 and resp.json().get("total", 0) > 0:
+					latencies.append(checked_at - sync_started)
+					detection_gaps.append(checked_at - previous)
+					return True
+				return False
+
+			deadline = time.time() + args.search_timeout
+			while pending and time.time() < deadline:
+				round_started = time.time()
+				batch = [pending.popleft() for _ in range(min(args.probe_batch, len(pending)))]
+				found = await asyncio.gather(*(probe(token) for token in batch))
+				pending.extend(token for token, seen in zip(batch, found) if not seen)
+				await asyncio.sleep(max(0.0, args.poll_interval - (time.time() - round_started)))
+		finally:
+			await client.delete(f"/emails/accounts/{account_id}")
+
+	print(f"\n[end-to-end] {len(latencies)}/{len(tokens)} messages searchable within {args.search_timeout}s")
+	if latencies:
+		print(f"  Searchable throughput: {len(latencies) / max(latencies):,.1f} msg/s "
+			f"({len(latencies)} messages in {max(latencies):.1f}s after the sync request)")
+		print(f"  Latency to searchable: p50 {percentile(latencies, 50):.1f}s, "
+			f"p95 {percentile(latencies, 95):.1f}s, max {max(latencies):.1f}s (from sync request)")
+		print(f"  Resolution:            found within p50 {percentile(detection_gaps, 50):.1f}s, "
+			f"max {max(detection_gaps):.1f}s of the previous probe of the same message")
+
+
+async def run_burst(args):
+	mailbox = Mailbox()
+	imap = await asyncio.start_server(ImapStandIn(mailbox, args.rtt_ms / 1000).handle, args.bind, args.imap_port)
+	smtp = await asyncio.start_server(SmtpStandIn(mailbox).handle, args.bind, args.smtp_port)
+	imap_port = imap.sockets[0].getsockname()[1]
+	smtp_port = smtp.sockets[0].getsockname()[1]
+	print(f"Stand-ins listening: SMTP {args.bind}:{smtp_port}, IMAP {args.bind}:{imap_port}")
+
+	corpus = load_corpus(args.corpus)
+	run_id = uuid.uuid4().hex[:8]
+	built = [build_message(i, run_id, corpus, args.max_attachments) for i in range(args.messages)]
+	tokens = [token for token, _ in built]
+
+	started = time.perf_counter()
+	await seed_mailbox("127.0.0.1", smtp_port, [msg for _, msg in built], args.smtp_connections)
+	elapsed = time.perf_counter() - started
+	print(f"Seeded {len(mailbox.messages)} messages ({len(corpus)} source PDFs) "
+		f"in {elapsed:.2f}s ({len(mailbox.messages) / elapsed:,.1f} msg/s via SMTP)")
+
+	async with imap, smtp:
+		await asyncio.to_thread(check_stdlib_client, imap_port, len(mailbox.messages))
+		# The live measurement goes first so the local comparison below does not
+		# add its own run time to every end-to-end latency.
+		if args.api:
+			await measure_searchable(args, tokens, imap_port)
+		uids = [uid for uid, _ in mailbox.messages]
+		for mode in args.modes:
+			report_fetch(await fetch_all("127.0.0.1", imap_port, uids, mode, args.batch_size, args.pipeline_depth))
+
+
+def parse_args():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--messages", type=int, default=2000, help="Messages in the burst")
+	parser.add_argument("--max-attachments", type=int, default=3, help="Upper bound of PDFs per message")
+	parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Directory of PDFs to attach")
+	parser.add_argument("--modes", nargs="+", choices=["single", "batched", "pipelined"],
+		default=["single", "batched", "pipelined"])
+	parser.add_argument("--batch-size", type=int, default=50, help="UIDs per batched FETCH")
+	parser.add_argument("--pipeline-depth", type=int, default=32, help="FETCH commands in flight")
+	parser.add_argument("--rtt-ms", type=float, default=20.0, help="Simulated IMAP round-trip delay")
+	parser.add_argument("--smtp-connections", type=int, default=8, help="Parallel SMTP senders")
+	parser.add_argument("--bind", default="127.0.0.1", help="Interface the stand-ins listen on")
+	parser.add_argument("--imap-port", type=int, default=0, help="IMAP port (0 picks a free port)")
+	parser.add_argument("--smtp-port", type=int, default=0, help="SMTP port (0 picks a free port)")
+	parser.add_argument("--api", action="store_true", help="Also measure latency to searchable on a live server")
+	parser.add_argument("--base-url", default=BASE_URL)
+	parser.add_argument("--api-token", default=API_TOKEN)
+	parser.add_argument("--advertise-host", default="127.0.0.1", help="Host the server uses to reach the IMAP stand-in")
+	parser.add_argument("--search-concurrency", type=int, default=20)
+	parser.add_argument("--probe-batch", type=int, default=100, help="Pending messages probed per search round")
+	parser.add_argument("--poll-interval", type=float, default=1.0, help="Minimum seconds between search rounds")
+	parser.add_argument("--search-timeout", type=float, default=600.0)
+	args = parser.parse_args()
+	for name in ("messages", "max_attachments", "batch_size", "pipeline_depth", "smtp_connections",
+			"search_concurrency", "probe_batch"):
+		if getattr(args, name) < 1:
+			parser.error(f"--{name.replace('_', '-')} must be at least 1")
+	return args
+
+
+if __name__ == "__main__":
+	asyncio.run(run_burst(parse_args()))